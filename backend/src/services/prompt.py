@@ -1,10 +1,187 @@
-# This module is intentionally left minimal.
-# The backend uses TypeScript implementation at `backend/src/services/prompt.ts`.
-# Keeping a valid Python file here prevents syntax scanning errors.
+# Gemini-backed sentimental memory message generation.
+# The TypeScript backend (`prompt.ts`) is the primary integration point; this
+# module provides the same capability for Python callers (cv-service, scripts)
+# using the async Gemini client so batch generation overlaps network latency.
 
-from typing import Any
+import asyncio
+import atexit
+import json
+import os
 
+try:
+    from google import genai
+    GENAI_IMPORT_ERROR = None
+except Exception as _e:
+    genai = None
+    GENAI_IMPORT_ERROR = _e
 
-def noop(_: Any | None = None) -> None:
-    """No-op placeholder to keep this module valid."""
-    return None
\ No newline at end of file
+try:
+    import numpy as np
+    import faiss
+    from sentence_transformers import SentenceTransformer
+    HAS_SEMANTIC_CACHE = True
+except Exception:
+    HAS_SEMANTIC_CACHE = False
+
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash-latest")
+# Bound fan-out so batch generation respects Gemini QPM limits
+MAX_CONCURRENT_REQUESTS = int(os.getenv("GEMINI_MAX_CONCURRENCY", "5"))
+
+_client = None
+_semaphore: asyncio.Semaphore | None = None
+
+
+def _get_client():
+    """Lazily create one shared client; its `.aio` handle is reused by all calls."""
+    global _client
+    if genai is None:
+        raise RuntimeError(f"google-genai is not installed: {GENAI_IMPORT_ERROR}")
+    if _client is None:
+        _client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+    return _client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    return _semaphore
+
+
+# ---------- Prompt cache (exact + semantic tiers) ----------
+# Tier 1: exact dict keyed by (activity.lower(), relationship) — free hits on repeats.
+# Tier 2: sentence-embedding index over prior prompts; a near-duplicate activity
+# (cosine >= threshold) reuses the cached message and skips the LLM round-trip.
+CACHE_PATH = os.getenv("PROMPT_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompt_cache.json"))
+SEMANTIC_THRESHOLD = float(os.getenv("PROMPT_CACHE_THRESHOLD", "0.92"))
+
+_exact_cache: dict[str, str] = {}
+_cache_texts: list[str] = []  # responses aligned with rows of _cache_index
+_cache_index = None
+_embedder = None
+
+
+def _cache_key(activity: str, relationship: str) -> str:
+    return f"{activity.strip().lower()}|{relationship.strip().lower()}"
+
+
+def _get_embedder():
+    global _embedder, _cache_index
+    if _embedder is None:
+        _embedder = SentenceTransformer(os.getenv("PROMPT_CACHE_EMBED_MODEL", "all-MiniLM-L6-v2"))
+        dim = _embedder.get_sentence_embedding_dimension()
+        _cache_index = faiss.IndexFlatIP(dim)
+    return _embedder
+
+
+def _embed_normed(text: str):
+    vec = _get_embedder().encode([text]).astype("float32")
+    faiss.normalize_L2(vec)
+    return vec
+
+
+def _cache_lookup(activity: str, relationship: str) -> str | None:
+    hit = _exact_cache.get(_cache_key(activity, relationship))
+    if hit is not None:
+        return hit
+    if not HAS_SEMANTIC_CACHE or not _cache_texts:
+        return None
+    try:
+        sims, ids = _cache_index.search(_embed_normed(f"{activity} ({relationship})"), 1)
+        if float(sims[0][0]) >= SEMANTIC_THRESHOLD:
+            return _cache_texts[int(ids[0][0])]
+    except Exception as e:
+        print(f"[warn] semantic cache lookup failed: {e}")
+    return None
+
+
+def _cache_insert(activity: str, relationship: str, text: str) -> None:
+    _exact_cache[_cache_key(activity, relationship)] = text
+    if not HAS_SEMANTIC_CACHE:
+        return
+    try:
+        _cache_index.add(_embed_normed(f"{activity} ({relationship})"))
+        _cache_texts.append(text)
+    except Exception as e:
+        print(f"[warn] semantic cache insert failed: {e}")
+
+
+def _load_cache() -> None:
+    try:
+        if os.path.exists(CACHE_PATH):
+            with open(CACHE_PATH, "r", encoding="utf-8") as f:
+                _exact_cache.update(json.load(f).get("exact", {}))
+    except Exception as e:
+        print(f"[warn] failed to load prompt cache: {e}")
+
+
+def _save_cache() -> None:
+    try:
+        with open(CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"exact": _exact_cache}, f)
+    except Exception as e:
+        print(f"[warn] failed to save prompt cache: {e}")
+
+
+_load_cache()
+atexit.register(_save_cache)
+
+
+def _build_prompt(person_name: str, relationship: str, activity: str) -> str:
+    return (
+        f"Based on this information about {person_name}, create a short, warm, sentimental message "
+        "(2-3 sentences) that builds on the activity and relationship. Keep it under 50 words.\n\n"
+        f"Person: {person_name} ({relationship})\n"
+        f"Activity: {activity}\n\n"
+        "Use present-friendly phrasing (e.g., 'This is Chris, your son... You were playing Valorant together.')."
+    )
+
+
+async def create_sentimental_memory(person_name: str, relationship: str, activity: str) -> str:
+    """Generate one sentimental message via the async Gemini client.
+
+    Async so callers fanning out over multiple (activity, person) tuples can
+    overlap the network+LLM round-trips instead of paying them serially.
+
+    Repeated or near-duplicate (activity, relationship) pairs are served from
+    the prompt cache without touching Gemini.
+    """
+    cached = _cache_lookup(activity, relationship)
+    if cached is not None:
+        return cached
+    client = _get_client()
+    async with _get_semaphore():
+        response = await client.aio.models.generate_content(
+            model=GEMINI_MODEL,
+            contents=_build_prompt(person_name, relationship, activity),
+        )
+    text = (response.text or "").strip()
+    if text:
+        _cache_insert(activity, relationship, text)
+    return text
+
+
+async def create_sentimental_memories_batch(cases: list) -> list[str]:
+    """Generate messages for many (person_name, relationship, activity) tuples concurrently.
+
+    Concurrency is bounded by the shared semaphore; with N-wide fan-out the
+    wall time approaches a single round-trip instead of N of them.
+    """
+    return await asyncio.gather(*[create_sentimental_memory(*c) for c in cases])
+
+
+if __name__ == "__main__":
+    _cases = [
+        ("Chris", "son", "playing Valorant together"),
+        ("Maria", "daughter", "baking cookies on Sunday"),
+        ("Sam", "grandson", "fishing at the lake"),
+        ("Ana", "caregiver", "doing the morning crossword"),
+        ("Leo", "friend", "watching old westerns"),
+    ]
+
+    async def _demo():
+        results = await create_sentimental_memories_batch(_cases)
+        for (name, _, _), text in zip(_cases, results):
+            print(f"--- {name} ---\n{text}\n")
+
+    asyncio.run(_demo())
@@ -6,13 +6,108 @@ Connects to Firestore using REST API to fetch patient data when faces are recogn
 import os
 import time
 import json
+import logging
+import threading
+from collections import OrderedDict
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter, Retry
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 import jwt
 from dotenv import load_dotenv
 
+# Optional google-auth: self-signed JWT credentials skip the
+# oauth2.googleapis.com exchange round-trip entirely; the manual
+# JWT-bearer flow below remains the fallback.
+# orjson parses the Firestore JSON responses a few times faster than the
+# stdlib decoder; photo-heavy person documents are where it shows.
+try:
+    import orjson
+    _loads = orjson.loads
+except Exception:
+    _loads = json.loads
+
+try:
+    import orjson as _orjson
+    _dumps = _orjson.dumps
+except Exception:
+    _dumps = lambda o: json.dumps(o).encode()
+
+# Optional ijson: stream-parse the photos runQuery response so a
+# photo-heavy person never holds raw-JSON dict and derived list in
+# memory at once.
+try:
+    import ijson
+    HAS_IJSON = True
+except Exception:
+    HAS_IJSON = False
+
+# Optional Redis L2: a shared cache behind the in-process LRU so multiple
+# cv-service replicas (or a restart) reuse each other's person fetches.
+try:
+    import redis
+    HAS_REDIS = True
+except Exception:
+    HAS_REDIS = False
+
+try:
+    from google.oauth2 import service_account
+    from google.auth.transport.requests import Request as _GoogleAuthRequest
+    HAS_GOOGLE_AUTH = True
+except Exception:
+    HAS_GOOGLE_AUTH = False
+
+# Small I/O pool for fanning out independent Firestore round-trips. The
+# service keeps a synchronous API on purpose: app.py always calls it from
+# worker threads (asyncio.to_thread / threadpool endpoints), so the event
+# loop is never blocked, and a sync interface stays callable from scripts
+# and __main__ checks without an event loop.
+_IO_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="firestore-io")
+
+# Level-gated logging on the lookup path: cache-miss/result chatter is
+# DEBUG, so at the default level a person lookup costs zero formatting
+# and zero stdout syscalls. FIRESTORE_LOG_LEVEL=DEBUG restores it.
+logging.basicConfig(format="%(levelname)s %(name)s: %(message)s")
+log = logging.getLogger("firestore_service")
+log.setLevel(os.getenv("FIRESTORE_LOG_LEVEL", "INFO"))
+
+def _unpacker(*specs):
+    """Compile a specialized extractor for a fixed Firestore fields schema.
+
+    The generic pattern `fields.get(name, {}).get(valueType, '')` costs two
+    method lookups, two dict probes and a throwaway dict per field per
+    document. For the handful of schemas we read, exec-compiling a
+    straight-line tuple expression once at import does the same work in a
+    single pass of bytecode with no temporaries.
+    """
+    body = ", ".join(
+        f"f[{name!r}].get({vt!r}, '') if {name!r} in f else ''"
+        for name, vt in specs)
+    ns = {}
+    exec(f"def _u(f):\n    return ({body},)", ns)
+    return ns["_u"]
+
+# (field, Firestore value type) schemas for the documents we consume
+_UNPACK_PERSON = _unpacker(("relation", "stringValue"),
+                           ("updatedAt", "timestampValue"))
+_UNPACK_PHOTO = _unpacker(("photoURL", "stringValue"),
+                          ("photoDescription", "stringValue"),
+                          ("uploadedAt", "timestampValue"))
+
+class _CacheEntry:
+    """Person-cache slot. __slots__ keeps each entry to a few pointers
+    instead of a per-entry dict, and attribute loads are cheaper than the
+    dict gets they replace — the LRU can hold hundreds of these."""
+    __slots__ = ("data", "ts", "neg")
+
+    def __init__(self, data, ts, neg=False):
+        self.data = data
+        self.ts = ts
+        self.neg = neg
+
+
 def _load_env_from_known_locations():
     here = os.path.dirname(os.path.abspath(__file__))
     candidates = [
@@ -23,10 +118,10 @@ def _load_env_from_known_locations():
     for p in candidates:
         if os.path.exists(p):
             load_dotenv(dotenv_path=p)
-            print(f"[env] loaded dotenv from {os.path.abspath(p)}")
+            log.info("loaded dotenv from %s", os.path.abspath(p))
             return os.path.abspath(p)
     # fallback to default env
-    print("[env] no dotenv file found in known locations; relying on process env")
+    log.info("no dotenv file found in known locations; relying on process env")
     return None
 
 # Load environment variables once at import
@@ -37,12 +132,53 @@ class FirestoreService:
         self.access_token = None
         self.token_expires_at = 0
 
-        # simple in-memory caches
-        self._person_cache = {}  # name -> {"data": dict, "ts": epoch_sec}
+        # One pooled session for the service's lifetime: keep-alive plus TLS
+        # session reuse drops the per-call handshake to oauth2/firestore
+        # endpoints, and the pool is wide enough for the I/O fan-out.
+        self._session = requests.Session()
+        _adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                               max_retries=Retry(total=2, backoff_factor=0.1,
+                                                 status_forcelist=[502, 503, 504]))
+        self._session.mount("https://", _adapter)
+
+        # simple in-memory caches; the person cache is LRU-bounded so a
+        # long-lived process scanning many names can't grow it unboundedly.
+        # Timestamps are time.monotonic(): freshness must not depend on a
+        # wall clock that NTP or a VM migration can step.
+        self._person_cache = OrderedDict()  # name -> _CacheEntry
         self._people_list_cache = {"data": None, "ts": 0}
-        # TTLs
+        # TTLs / caps
         self.person_ttl_sec = int(os.getenv("FIRESTORE_PERSON_TTL_SEC", "300"))
         self.people_list_ttl_sec = int(os.getenv("FIRESTORE_PEOPLE_TTL_SEC", "300"))
+        self.person_cache_max = int(os.getenv("FIRESTORE_PERSON_CACHE_MAX", "512"))
+        # negative entries (404s) absorb repeated unknown-name lookups briefly
+        self.neg_ttl_sec = int(os.getenv("FIRESTORE_NEG_TTL_SEC", "60"))
+        # optional Redis L2 behind the local L1; opt-in via REDIS_URL
+        self._redis = None
+        _redis_url = os.getenv("REDIS_URL")
+        if _redis_url and HAS_REDIS:
+            try:
+                self._redis = redis.Redis.from_url(
+                    _redis_url, socket_timeout=2, socket_connect_timeout=2)
+                self._redis.ping()
+                log.info("Redis L2 person cache enabled")
+            except Exception as e:
+                log.warning("Redis unavailable, continuing without L2 cache: %s", e)
+                self._redis = None
+        # single-flight: one fetch per name at a time, followers wait
+        self._inflight_guard = threading.Lock()
+        self._inflight_locks = {}
+        self._signing_key_obj = None
+        self._google_creds = None
+        self._auth_headers = None  # rebuilt whenever a token is minted
+        # single refresher at a time: double-checked locking keeps the
+        # token fast path lock-free while serializing actual refreshes
+        self._token_lock = threading.Lock()
+        # background refresh keeps the token perpetually fresh so the hot
+        # path never pays a synchronous OAuth round-trip; started lazily
+        # after the first successful mint
+        self._bg_refresh = os.getenv("FIRESTORE_BG_REFRESH", "1") not in ("0", "false", "False")
+        self._refresher_started = False
         # credentials
         self.project_id = os.getenv('FIREBASE_PROJECT_ID')
         self.client_email = os.getenv('FIREBASE_CLIENT_EMAIL')
@@ -62,174 +198,495 @@ class FirestoreService:
             raise ValueError("Missing Firebase credentials in environment variables")
         
         self.base_url = f"https://firestore.googleapis.com/v1/projects/{self.project_id}/databases/(default)/documents"
-        print(f"✓ Firebase CV Service initialized for project: {self.project_id}")
+        log.info("Firebase CV Service initialized for project: %s", self.project_id)
     
+    def _signing_key(self):
+        """Parsed RSA key, loaded once: PEM parsing costs more than the JWT
+        signature itself, and the key never changes within a process."""
+        if self._signing_key_obj is None:
+            pem = self.private_key.replace('\\n', '\n').strip('"')
+            self._signing_key_obj = serialization.load_pem_private_key(pem.encode(), password=None)
+        return self._signing_key_obj
+
+    def get_auth_headers(self):
+        """Ready-to-send headers for the current token; the dict is built
+        once per refresh instead of once per call."""
+        self.get_access_token()
+        return self._auth_headers
+
     def get_access_token(self):
         """Generate JWT token and exchange for access token"""
         try:
             # Check if current token is still valid
             if self.access_token and time.time() < self.token_expires_at:
                 return self.access_token
-            
-            # Create JWT token
-            now = int(time.time())
-            payload = {
-                'iss': self.client_email,
-                'scope': 'https://www.googleapis.com/auth/datastore',
-                'aud': 'https://oauth2.googleapis.com/token',
-                'exp': now + 3600,  # 1 hour
-                'iat': now
-            }
-            
-            # Clean up private key
-            private_key = self.private_key.replace('\\n', '\n').strip('"')
-            
-            # Sign JWT
-            token = jwt.encode(payload, private_key, algorithm='RS256')
-            
-            # Exchange JWT for access token
-            response = requests.post('https://oauth2.googleapis.com/token', data={
-                'grant_type': 'urn:ietf:params:oauth:grant-type:jwt-bearer',
-                'assertion': token
-            }, timeout=20, verify=self._verify_param)
-            
-            if response.status_code == 200:
-                token_data = response.json()
-                self.access_token = token_data['access_token']
-                self.token_expires_at = now + 3500  # Refresh 5 minutes before expiry
-                print("✅ Firebase access token obtained successfully")
-                return self.access_token
-            else:
-                raise Exception(f"Token request failed: {response.status_code} - {response.text}")
-        
+
+            with self._token_lock:
+                return self._refresh_token()
+
         except Exception as e:
-            print(f"❌ Error getting Firebase access token: {e}")
+            log.error("Error getting Firebase access token: %s", e)
             raise e
-    
+
+    def _refresh_token(self, force: bool = False):
+        """Mint a fresh token; callers hold self._token_lock.
+
+        Re-checks validity first so a herd of threads that all saw an
+        expired token performs one OAuth exchange — the same single-flight
+        shape as the person-cache loader. The background refresher passes
+        force=True to renew early; the old token and expiry stay in place
+        until the new one is minted, so foreground callers keep their
+        lock-free fast path (and a working token) throughout.
+        """
+        # re-check under the lock: the previous holder may have
+        # refreshed while we waited
+        if not force and self.access_token and time.time() < self.token_expires_at:
+            return self.access_token
+
+        if HAS_GOOGLE_AUTH:
+            if self._google_creds is None:
+                creds = service_account.Credentials.from_service_account_info(
+                    {
+                        "type": "service_account",
+                        "project_id": self.project_id,
+                        "client_email": self.client_email,
+                        "private_key": self.private_key.replace('\\n', '\n').strip('"'),
+                        "token_uri": "https://oauth2.googleapis.com/token",
+                    },
+                    scopes=["https://www.googleapis.com/auth/datastore"],
+                )
+                # self-signed JWT access: the "token" is minted locally and
+                # Firestore verifies it directly, skipping the exchange hop
+                # to oauth2.googleapis.com (older google-auth falls back to
+                # the JWT-bearer exchange against token_uri)
+                try:
+                    creds = creds.with_always_use_jwt_access(True)
+                except AttributeError:
+                    pass
+                self._google_creds = creds
+            self._google_creds.refresh(_GoogleAuthRequest(session=self._session))
+            self.access_token = self._google_creds.token
+            expiry = self._google_creds.expiry
+            # google-auth expiries are naive UTC; .timestamp() on a naive
+            # datetime assumes local time, which would skew validity by the
+            # host's UTC offset
+            if expiry is not None:
+                expires_at = expiry.replace(tzinfo=timezone.utc).timestamp()
+            else:
+                expires_at = time.time() + 3600
+            self.token_expires_at = expires_at - 100
+            self._auth_headers = {'Authorization': f'Bearer {self.access_token}',
+                                  'Content-Type': 'application/json'}
+            log.info("Firebase access token obtained via google-auth")
+            self._ensure_refresher()
+            return self.access_token
+        
+        # Create JWT token
+        now = int(time.time())
+        payload = {
+            'iss': self.client_email,
+            'scope': 'https://www.googleapis.com/auth/datastore',
+            'aud': 'https://oauth2.googleapis.com/token',
+            'exp': now + 3600,  # 1 hour
+            'iat': now
+        }
+        
+        # Sign JWT with the cached key object
+        token = jwt.encode(payload, self._signing_key(), algorithm='RS256')
+        
+        # Exchange JWT for access token
+        response = self._session.post('https://oauth2.googleapis.com/token', data={
+            'grant_type': 'urn:ietf:params:oauth:grant-type:jwt-bearer',
+            'assertion': token
+        }, timeout=20, verify=self._verify_param)
+        
+        if response.status_code == 200:
+            token_data = _loads(response.content)
+            self.access_token = token_data['access_token']
+            self.token_expires_at = now + 3500  # Refresh 5 minutes before expiry
+            self._auth_headers = {'Authorization': f'Bearer {self.access_token}',
+                                  'Content-Type': 'application/json'}
+            log.info("Firebase access token obtained successfully")
+            self._ensure_refresher()
+            return self.access_token
+        else:
+            raise Exception(f"Token request failed: {response.status_code} - {response.text}")
+
+    def _ensure_refresher(self):
+        if not self._bg_refresh or self._refresher_started:
+            return
+        self._refresher_started = True
+        threading.Thread(target=self._token_refresher,
+                         name="firestore-token-refresh", daemon=True).start()
+
+    def _token_refresher(self):
+        """Refresh the token shortly before expiry so foreground callers
+        only ever take the validity fast path (a time comparison plus a
+        dict read) instead of stalling on the OAuth exchange."""
+        while True:
+            delay = max(self.token_expires_at - 300 - time.time(), 30)
+            time.sleep(delay)
+            try:
+                with self._token_lock:
+                    self._refresh_token(force=True)
+            except Exception as e:
+                # the current token is untouched and typically still has
+                # several minutes left; just retry
+                log.warning("Background token refresh failed (will retry): %s", e)
+                time.sleep(30)
+
+    def _cache_fresh(self, person_name: str, now: float) -> bool:
+        cached = self._person_cache.get(person_name)
+        if not cached:
+            return False
+        ttl = self.neg_ttl_sec if cached.neg else self.person_ttl_sec
+        return (now - cached.ts) < ttl
+
+    def _name_lock(self, person_name: str) -> threading.Lock:
+        with self._inflight_guard:
+            lock = self._inflight_locks.get(person_name)
+            if lock is None:
+                lock = self._inflight_locks[person_name] = threading.Lock()
+            return lock
+
     def get_person_data(self, person_name: str, bypass_cache: bool = False):
         """
         Fetch person data and their photos from Firestore
         Returns: dict with person info and photos, or None if not found
+
+        Concurrent lookups of the same name coalesce into one fetch: the
+        per-name lock makes followers wait and then hit the cache the
+        leader just filled, instead of issuing duplicate round-trips.
         """
         try:
-            now = time.time()
-            # cache hit
-            cached = self._person_cache.get(person_name)
-            if not bypass_cache and cached and (now - cached["ts"]) < self.person_ttl_sec:
-                return cached["data"]
+            now = time.monotonic()
+            # cache hit (negative entries use their own, shorter TTL)
+            if not bypass_cache and self._cache_fresh(person_name, now):
+                self._person_cache.move_to_end(person_name)
+                return self._person_cache[person_name].data
 
-            print(f"🔍 Looking up person (cache miss): {person_name}")
-            
-            access_token = self.get_access_token()
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json'
-            }
-            
-            # Get person document
-            person_url = f"{self.base_url}/people/{person_name}"
+            with self._name_lock(person_name):
+                # re-check: another thread may have fetched while we waited
+                now = time.monotonic()
+                if not bypass_cache and self._cache_fresh(person_name, now):
+                    self._person_cache.move_to_end(person_name)
+                    return self._person_cache[person_name].data
+
+                # L2 before Firestore: a sibling replica may have fetched
+                # this name already
+                result = self._l2_get(person_name)
+                if result is not None:
+                    self._person_cache[person_name] = _CacheEntry(result, now)
+                    self._person_cache.move_to_end(person_name)
+                    while len(self._person_cache) > self.person_cache_max:
+                        self._person_cache.popitem(last=False)
+                    return result
+
+                log.debug("Looking up person (cache miss): %s", person_name)
+                result = self._fetch_person(person_name)
+                if result is None:
+                    # negative-cache the miss: bursts of a misrecognized name
+                    # would otherwise hammer Firestore every frame
+                    self._person_cache[person_name] = _CacheEntry(None, now, neg=True)
+                    self._person_cache.move_to_end(person_name)
+                    return None
+
+                self._l2_put(person_name, result)
+
+                # update cache, evicting least-recently-used entries past the cap
+                self._person_cache[person_name] = _CacheEntry(result, now)
+                self._person_cache.move_to_end(person_name)
+                while len(self._person_cache) > self.person_cache_max:
+                    self._person_cache.popitem(last=False)
+                return result
+
+        except Exception as e:
+            log.error("Error fetching person data for '%s': %s", person_name, e)
+            return None
+
+    @staticmethod
+    def _iter_query_docs(response):
+        """Yield the 'document' payloads from a runQuery response.
+
+        With ijson available the array is parsed incrementally off the
+        response stream, so only one photo document is materialized at a
+        time instead of the raw parse tree plus the derived list.
+        """
+        if HAS_IJSON:
+            try:
+                response.raw.decode_content = True  # undo gzip before ijson sees it
+                for doc in ijson.items(response.raw, 'item.document'):
+                    if doc:
+                        yield doc
+                return
+            finally:
+                response.close()
+        for entry in _loads(response.content):
+            doc = entry.get('document')
+            if doc:
+                yield doc
+
+    def _fetch_person(self, person_name: str):
+        """One uncached person+photos fetch; returns the assembled dict or None."""
+        headers = self.get_auth_headers()
+
+        # Fetch the person document and its photos subcollection
+        # concurrently: they are independent round-trips, so a cache
+        # miss costs max(latency) instead of the sum.
+        person_url = f"{self.base_url}/people/{person_name}"
+        # Photos come via :runQuery parented at the person document: one
+        # RPC for the whole subcollection regardless of size, instead of
+        # the documents-list endpoint (which pages at 100 docs).
+        t0 = time.time()
+        # mask to the two consumed fields; photo blobs or future large
+        # fields on the person doc never cross the wire
+        person_future = _IO_POOL.submit(
+            self._session.get, f"{person_url}?mask.fieldPaths=relation&mask.fieldPaths=updatedAt",
+            headers=headers, timeout=20, verify=self._verify_param)
+        photos_future = _IO_POOL.submit(
+            self._session.post, f"{person_url}:runQuery",
+            headers=headers, json=self._PHOTOS_QUERY, timeout=20,
+            verify=self._verify_param, stream=HAS_IJSON)
+        person_response = person_future.result()
+        photos_response = photos_future.result()
+
+        if person_response.status_code == 404:
+            log.debug("Person '%s' not found in database", person_name)
+            photos_response.close()
+            return None
+
+        if person_response.status_code != 200:
+            log.warning("Error fetching person data: %s", person_response.status_code)
+            photos_response.close()
+            return None
+
+        person_data = _loads(person_response.content)
+
+        result = self._assemble_person(person_name, person_data.get('fields', {}),
+                                       self._parse_photos(photos_response))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Found person '%s' with %d photos in %d ms",
+                      person_name, result['photo_count'], int((time.time() - t0) * 1000))
+        return result
+
+    def _parse_photos(self, photos_response):
+        """Photo dicts from a photos runQuery response (empty on error)."""
+        photos = []
+        if photos_response.status_code == 200:
+            # runQuery returns a JSON array of result entries; rows
+            # carrying a document hold one photo each
+            for doc in self._iter_query_docs(photos_response):
+                url, desc, uploaded = _UNPACK_PHOTO(doc.get('fields', {}))
+                photos.append({
+                    'id': doc['name'].split('/')[-1],
+                    'photoURL': url,
+                    'photoDescription': desc,
+                    'uploadedAt': uploaded,
+                })
+        else:
+            photos_response.close()
+        return photos
+
+    @staticmethod
+    def _assemble_person(person_name, fields, photos):
+        relation, updated_at = _UNPACK_PERSON(fields)
+        return {
+            'name': person_name,
+            'relation': relation,
+            'photos': photos,
+            'photo_count': len(photos),
+            'most_recent_photo': photos[-1]['photoURL'] if photos else None,
+            'updated_at': updated_at
+        }
+
+    _PHOTOS_QUERY = {"structuredQuery": {
+        "from": [{"collectionId": "photos"}],
+        "select": {"fields": [
+            {"fieldPath": "photoURL"},
+            {"fieldPath": "photoDescription"},
+            {"fieldPath": "uploadedAt"},
+        ]},
+    }}
+
+    def get_people_data(self, names, bypass_cache: bool = False):
+        """Fetch several people at once; returns {name: data-or-None}.
+
+        Cache misses share a single documents:batchGet round-trip for the
+        person documents while the per-name photo queries fan out on the
+        I/O pool, so looking up every face in a frame costs one RTT of
+        wall time instead of one per person.
+        """
+        results = {}
+        to_fetch = []
+        now = time.monotonic()
+        for name in dict.fromkeys(names):  # dedupe, keep order
+            if not bypass_cache and self._cache_fresh(name, now):
+                self._person_cache.move_to_end(name)
+                results[name] = self._person_cache[name].data
+            else:
+                to_fetch.append(name)
+        if not to_fetch:
+            return results
+
+        try:
+            headers = self.get_auth_headers()
             t0 = time.time()
-            person_response = requests.get(person_url, headers=headers, timeout=20, verify=self._verify_param)
-            
-            if person_response.status_code == 404:
-                print(f"❌ Person '{person_name}' not found in database")
-                return None
-            
-            if person_response.status_code != 200:
-                print(f"❌ Error fetching person data: {person_response.status_code}")
-                return None
-            
-            person_data = person_response.json()
-            
-            # Get person's photos
-            photos_url = f"{self.base_url}/people/{person_name}/photos"
-            photos_response = requests.get(photos_url, headers=headers, timeout=20, verify=self._verify_param)
-            
-            photos = []
-            if photos_response.status_code == 200:
-                photos_data = photos_response.json()
-                if 'documents' in photos_data:
-                    for doc in photos_data['documents']:
-                        fields = doc['fields']
-                        photo = {
-                            'id': doc['name'].split('/')[-1],
-                            'photoURL': fields.get('photoURL', {}).get('stringValue', ''),
-                            'photoDescription': fields.get('photoDescription', {}).get('stringValue', ''),
-                            'uploadedAt': fields.get('uploadedAt', {}).get('timestampValue', '')
-                        }
-                        photos.append(photo)
-            
-            # Extract person fields
-            fields = person_data.get('fields', {})
-            result = {
-                'name': person_name,
-                'relation': fields.get('relation', {}).get('stringValue', ''),
-                'photos': photos,
-                'photo_count': len(photos),
-                'most_recent_photo': photos[-1]['photoURL'] if photos else None,
-                'updated_at': fields.get('updatedAt', {}).get('timestampValue', '')
+            photo_futures = {
+                name: _IO_POOL.submit(
+                    self._session.post, f"{self.base_url}/people/{name}:runQuery",
+                    headers=headers, json=self._PHOTOS_QUERY, timeout=20,
+                    verify=self._verify_param, stream=HAS_IJSON)
+                for name in to_fetch
             }
-            t_ms = int((time.time() - t0) * 1000)
-            print(f"✅ Found person '{person_name}' with {len(photos)} photos in {t_ms} ms")
+            # batchGet takes full resource names and answers each with a
+            # 'found' document or a 'missing' marker
+            doc_prefix = f"projects/{self.project_id}/databases/(default)/documents/people/"
+            batch_body = {
+                "documents": [doc_prefix + name for name in to_fetch],
+                "mask": {"fieldPaths": ["relation", "updatedAt"]},
+            }
+            response = self._session.post(f"{self.base_url}:batchGet",
+                                          headers=headers, json=batch_body,
+                                          timeout=20, verify=self._verify_param)
+
+            if response.status_code != 200:
+                log.warning("batchGet failed (%s); falling back to per-name fetches",
+                            response.status_code)
+                for fut in photo_futures.values():
+                    try:
+                        fut.result().close()
+                    except Exception:
+                        pass
+                for name in to_fetch:
+                    results[name] = self.get_person_data(name, bypass_cache=bypass_cache)
+                return results
+
+            found = {}
+            for entry in _loads(response.content):
+                doc = entry.get('found')
+                if doc:
+                    found[doc['name'].split('/')[-1]] = doc.get('fields', {})
+
+            now = time.monotonic()
+            for name in to_fetch:
+                fields = found.get(name)
+                if fields is None:
+                    # same negative-caching as the single-name path
+                    self._person_cache[name] = _CacheEntry(None, now, neg=True)
+                    self._person_cache.move_to_end(name)
+                    results[name] = None
+                    try:
+                        photo_futures[name].result().close()
+                    except Exception:
+                        pass
+                    continue
+                result = self._assemble_person(name, fields,
+                                               self._parse_photos(photo_futures[name].result()))
+                self._l2_put(name, result)
+                self._person_cache[name] = _CacheEntry(result, now)
+                self._person_cache.move_to_end(name)
+                results[name] = result
+            while len(self._person_cache) > self.person_cache_max:
+                self._person_cache.popitem(last=False)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("batchGet fetched %d people (%d found) in %d ms",
+                          len(to_fetch), len(found), int((time.time() - t0) * 1000))
+            return results
 
-            # update cache
-            self._person_cache[person_name] = {"data": result, "ts": now}
-            return result
-            
         except Exception as e:
-            print(f"❌ Error fetching person data for '{person_name}': {e}")
-            return None
-    
+            log.error("Error batch-fetching people %s: %s", to_fetch, e)
+            for name in to_fetch:
+                results.setdefault(name, None)
+            return results
+
     def get_all_people(self, bypass_cache: bool = False):
         """
         Get list of all people in the database
         Returns: list of person names
         """
         try:
-            now = time.time()
+            now = time.monotonic()
             if not bypass_cache and self._people_list_cache["data"] is not None and (now - self._people_list_cache["ts"]) < self.people_list_ttl_sec:
                 return self._people_list_cache["data"]
 
-            print("🔍 Fetching all people from database (cache miss)")
+            log.debug("Fetching all people from database (cache miss)")
             
-            access_token = self.get_access_token()
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json'
-            }
+            headers = self.get_auth_headers()
             
-            people_url = f"{self.base_url}/people"
+            # select __name__ only: the caller wants names, so don't ship
+            # every person document's fields back
             t0 = time.time()
-            response = requests.get(people_url, headers=headers, timeout=20, verify=self._verify_param)
+            query = {"structuredQuery": {
+                "from": [{"collectionId": "people"}],
+                "select": {"fields": [{"fieldPath": "__name__"}]},
+            }}
+            response = self._session.post(f"{self.base_url}:runQuery",
+                                          headers=headers, json=query, timeout=20, verify=self._verify_param)
             
             if response.status_code == 200:
-                data = response.json()
                 people = []
-                if 'documents' in data:
-                    for doc in data['documents']:
-                        person_name = doc['name'].split('/')[-1]
-                        people.append(person_name)
+                for entry in _loads(response.content):
+                    doc = entry.get('document')
+                    if doc:
+                        people.append(doc['name'].split('/')[-1])
                 
-                t_ms = int((time.time() - t0) * 1000)
-                print(f"✅ Found {len(people)} people in database in {t_ms} ms: {people}")
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("Found %d people in database in %d ms: %s",
+                              len(people), int((time.time() - t0) * 1000), people)
                 # update cache
                 self._people_list_cache = {"data": people, "ts": now}
                 return people
             else:
-                print(f"❌ Error fetching people list: {response.status_code}")
+                log.warning("Error fetching people list: %s", response.status_code)
                 return []
         
         except Exception as e:
-            print(f"❌ Error fetching people list: {e}")
+            log.error("Error fetching people list: %s", e)
             return []
 
+    def _l2_get(self, person_name: str):
+        if self._redis is None:
+            return None
+        try:
+            raw = self._redis.get(f"memorai:person:{person_name}")
+            return _loads(raw) if raw else None
+        except Exception as e:
+            log.warning("Redis L2 get failed: %s", e)
+            return None
+
+    def _l2_put(self, person_name: str, data):
+        if self._redis is None:
+            return
+        try:
+            # Redis owns freshness via ex=; entries expire on the same
+            # clock as the local TTL
+            self._redis.set(f"memorai:person:{person_name}", _dumps(data),
+                            ex=self.person_ttl_sec)
+        except Exception as e:
+            log.warning("Redis L2 put failed: %s", e)
+
+    def warm_caches(self):
+        """Prefetch the people list and every person document so the first
+        recognition after boot hits warm caches instead of a burst of cold
+        Firestore round-trips. Fetches fan out on the I/O pool; per-name
+        single-flight locks keep this safe alongside live traffic."""
+        t0 = time.time()
+        people = self.get_all_people()
+        list(_IO_POOL.map(self.get_person_data, people))
+        t_ms = int((time.time() - t0) * 1000)
+        log.info("Warmed caches for %d people in %d ms", len(people), t_ms)
+        return {"ok": True, "people": len(people), "ms": t_ms}
+
     def cache_stats(self):
-        now = time.time()
+        now = time.monotonic()
         return {
             "person_entries": len(self._person_cache),
-            "person_entries_age_sec": {k: int(now - v["ts"]) for k, v in self._person_cache.items()},
+            "negative_entries": sum(1 for v in self._person_cache.values() if v.neg),
+            "neg_ttl_sec": self.neg_ttl_sec,
+            "person_entries_age_sec": {k: int(now - v.ts) for k, v in self._person_cache.items()},
             "people_list_cached": self._people_list_cache["data"] is not None,
             "people_list_age_sec": int(now - self._people_list_cache["ts"]) if self._people_list_cache["data"] is not None else None,
+            "redis_l2": self._redis is not None,
             "person_ttl_sec": self.person_ttl_sec,
             "people_list_ttl_sec": self.people_list_ttl_sec,
         }
@@ -237,7 +694,7 @@ class FirestoreService:
     def invalidate_caches(self):
         self._person_cache.clear()
         self._people_list_cache = {"data": None, "ts": 0}
-        print("🧹 FirestoreService caches invalidated")
+        log.info("FirestoreService caches invalidated")
 
 # Global instance
 firestore_service = FirestoreService()
\ No newline at end of file